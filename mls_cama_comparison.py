@@ -1,18 +1,43 @@
-from IPython import get_ipython
-from IPython.display import display
 import pandas as pd
 import numpy as np
+import importlib.util
 import os
+import re
+import zipfile
+from typing import NamedTuple
 
-# Install required package for Excel hyperlinks if not available
+# IPython is only needed for rich debug tables in notebooks; plain Python runs print them instead
 try:
-    import openpyxl
+    from IPython.display import display
 except ImportError:
-    import subprocess
-    import sys
-    print("Installing openpyxl for Excel file creation...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "--break-system-packages", "openpyxl"])
-    import openpyxl
+    def display(obj):
+        print(obj)
+
+# pyarrow is optional - when available, parsed Excel inputs are cached as Parquet
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# xlsxwriter is optional - when available, reports are streamed to disk row by row
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
+
+# python-calamine is optional - when available (pandas 2.2+), Excel files are parsed by its Rust reader
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    HAS_CALAMINE = False
+
+# Colab is detected without importing it; the reports are only downloaded there
+IN_COLAB = importlib.util.find_spec('google') is not None and importlib.util.find_spec('google.colab') is not None
 
 # --- Configuration ---
 MLS_DATA_PATH = '/MLS_11-7-25.xlsx'
@@ -20,32 +45,51 @@ CAMA_DATA_PATH = '/CAMA_OCT_31.xls'
 
 UNIQUE_ID_COLUMN = {'mls_col': 'Parcel Number', 'cama_col': 'PARID'}
 
+class DirectCmp(NamedTuple):
+    """1-to-1 comparison of an MLS column against a CAMA column."""
+    mls_col: str
+    cama_col: str
+
+class SumCmp(NamedTuple):
+    """Comparison of an MLS column against the sum of several CAMA columns."""
+    mls_col: str
+    cama_cols: tuple
+
+class CatCmp(NamedTuple):
+    """Text-contains check on an MLS column mapped to an expected CAMA value."""
+    mls_col: str
+    cama_col: str
+    mls_check_contains: str
+    cama_expected_if_true: int
+    cama_expected_if_false: int
+    case_sensitive: bool = False
+
 # CORRECTED column mappings based on actual Excel file headers
-COLUMNS_TO_COMPARE = [
-    {'mls_col': 'Above Grade Finished Area', 'cama_col': 'SFLA'},
-    {'mls_col': 'Bedrooms Total', 'cama_col': 'RMBED'},
-    {'mls_col': 'Bathrooms Full', 'cama_col': 'FIXBATH'},
-    {'mls_col': 'Bathrooms Half', 'cama_col': 'FIXHALF'},
-]
+COLUMNS_TO_COMPARE = (
+    DirectCmp(mls_col='Above Grade Finished Area', cama_col='SFLA'),
+    DirectCmp(mls_col='Bedrooms Total', cama_col='RMBED'),
+    DirectCmp(mls_col='Bathrooms Full', cama_col='FIXBATH'),
+    DirectCmp(mls_col='Bathrooms Half', cama_col='FIXHALF'),
+)
 
 # SPECIAL COMPARISON: Sum multiple CAMA columns to compare against one MLS column
 # MLS "Below Grade Finished Area" should equal sum of CAMA (RECROMAREA + FINBSMTAREA + UFEATAREA)
-COLUMNS_TO_COMPARE_SUM = [
-    {'mls_col': 'Below Grade Finished Area', 'cama_cols': ['RECROMAREA', 'FINBSMTAREA', 'UFEATAREA']}
-]
+COLUMNS_TO_COMPARE_SUM = (
+    SumCmp(mls_col='Below Grade Finished Area', cama_cols=('RECROMAREA', 'FINBSMTAREA', 'UFEATAREA')),
+)
 
 # CATEGORICAL COMPARISON: Check if MLS field contains text, map to CAMA numeric value
 # If MLS "Cooling" contains "Central Air", CAMA "HEAT" should be 1; otherwise 0
-COLUMNS_TO_COMPARE_CATEGORICAL = [
-    {
-        'mls_col': 'Cooling',
-        'cama_col': 'HEAT',
-        'mls_check_contains': 'Central Air',  # Check if MLS contains this text
-        'cama_expected_if_true': 1,            # Expected CAMA value if MLS contains text
-        'cama_expected_if_false': 0,           # Expected CAMA value if MLS does not contain text
-        'case_sensitive': False                # Case-insensitive search
-    }
-]
+COLUMNS_TO_COMPARE_CATEGORICAL = (
+    CatCmp(
+        mls_col='Cooling',
+        cama_col='HEAT',
+        mls_check_contains='Central Air',  # Check if MLS contains this text
+        cama_expected_if_true=1,            # Expected CAMA value if MLS contains text
+        cama_expected_if_false=0,           # Expected CAMA value if MLS does not contain text
+        case_sensitive=False                # Case-insensitive search
+    ),
+)
 
 # TOLERANCE SETTING - Adjust this if needed!
 NUMERIC_TOLERANCE = 0.01  # Absolute tolerance for numeric comparisons
@@ -53,6 +97,46 @@ NUMERIC_TOLERANCE = 0.01  # Absolute tolerance for numeric comparisons
 # SKIP ZERO VALUES - Set to True if 0 in MLS means "no data"
 SKIP_ZERO_VALUES = True  # Change to False if 0 is a valid value to compare
 
+# OUTPUT FORMAT - 'xlsx' (hyperlinked reports), or 'parquet' / 'csv' for feeding other tools
+OUTPUT_FORMAT = os.environ.get('OUTPUT_FORMAT', 'xlsx').lower()
+
+# COLUMN TYPES - Passed to read_excel so the parser skips per-cell type inference
+# (keep these in sync with the column mappings above)
+# Parcel IDs use Arrow-backed strings when pyarrow is installed: merging hashes the raw UTF-8 bytes
+ID_DTYPE = 'string[pyarrow]' if HAS_PYARROW else 'string'
+# Other text fields likewise: one Arrow buffer per column instead of a Python str object per cell
+TEXT_DTYPE = 'string[pyarrow]' if HAS_PYARROW else 'string'
+# Area fields are often blank: Arrow floats keep blanks as real nulls instead of NaN-filled numpy floats
+AREA_DTYPE = pd.ArrowDtype(pa.float64()) if HAS_PYARROW else 'float64'
+
+MLS_DTYPES = {
+    'Parcel Number': ID_DTYPE,
+    'Above Grade Finished Area': AREA_DTYPE,
+    'Bedrooms Total': 'float64',
+    'Bathrooms Full': 'float64',
+    'Bathrooms Half': 'float64',
+    'Below Grade Finished Area': AREA_DTYPE,
+    'Cooling': TEXT_DTYPE,
+    # Report/address text: keeps listing numbers and ZIP codes verbatim instead of inferring numbers
+    'Listing #': TEXT_DTYPE,
+    'Address': TEXT_DTYPE,
+    'City': TEXT_DTYPE,
+    'State or Province': TEXT_DTYPE,
+    'Postal Code': TEXT_DTYPE,
+}
+CAMA_DTYPES = {
+    'PARID': ID_DTYPE,
+    'SFLA': AREA_DTYPE,
+    'RMBED': 'float64',
+    'FIXBATH': 'float64',
+    'FIXHALF': 'float64',
+    'RECROMAREA': AREA_DTYPE,
+    'FINBSMTAREA': AREA_DTYPE,
+    'UFEATAREA': AREA_DTYPE,
+    'HEAT': 'float64',
+    'ADDITIONAL_PARCELS': TEXT_DTYPE,
+}
+
 # ==================================================================================
 # HYPERLINK CONFIGURATION - WINDOW ID INPUT
 # ==================================================================================
@@ -95,43 +179,126 @@ ADDRESS_COLUMNS = {
     'zip': 'Postal Code'
 }
 
-def format_zillow_url(address, city, state, zip_code):
+# Patterns used to turn an address into a Zillow URL slug, compiled once
+_UNIT_RE = re.compile(r'\s+(Apt|Unit|#|Suite)\s*[\w-]*$', re.IGNORECASE)
+_NONWORD_RE = re.compile(r'[^\w\s-]')
+_SPACE_RE = re.compile(r'\s+')
+
+def zillow_url_column(addresses, cities, zip_codes):
     """
-    Create a Zillow search URL from address components.
+    Create a Zillow search URL for each row of aligned Series of address components.
     Example: https://www.zillow.com/homes/1610-20th-St-NW-Canton-OH-44709_rb/
+    Returns an object Series of URLs, None where any component is missing.
+
+    A property usually appears in several records (one per mismatched field), so the
+    regex chain only runs on the distinct (address, city, zip) combinations.
     """
-    if pd.isna(address) or pd.isna(city) or pd.isna(zip_code):
-        return None
-    
-    # Clean and format each component
-    # Replace spaces with hyphens, remove special characters
-    import re
-    
-    address_clean = str(address).strip()
-    city_clean = str(city).strip()
-    zip_clean = str(zip_code).strip().split('-')[0]  # Remove ZIP+4 if present
-    
-    # Remove apartment/unit numbers (e.g., "Apt 2", "Unit B", "#3")
-    address_clean = re.sub(r'\s+(Apt|Unit|#|Suite)\s*[\w-]*$', '', address_clean, flags=re.IGNORECASE)
-    
-    # Replace spaces with hyphens and remove special characters except hyphens
-    address_formatted = re.sub(r'[^\w\s-]', '', address_clean)
-    address_formatted = re.sub(r'\s+', '-', address_formatted)
-    
-    city_formatted = re.sub(r'[^\w\s-]', '', city_clean)
-    city_formatted = re.sub(r'\s+', '-', city_formatted)
-    
-    # Construct the Zillow search URL - format: address-city-OH-zip_rb/
-    url_slug = f"{address_formatted}-{city_formatted}-OH-{zip_clean}_rb"
-    
-    return f"{ZILLOW_URL_BASE}{url_slug}/"
+    components = pd.DataFrame({'address': addresses, 'city': cities, 'zip': zip_codes})
+    distinct = components[~components.duplicated()]
+    combination = components.groupby(['address', 'city', 'zip'], sort=False, dropna=False).ngroup()
+
+    missing = distinct.isna().any(axis=1)
+    # Drop apartment/unit numbers (e.g. "Apt 2", "Unit B", "#3"), then special characters, then hyphenate spaces
+    address_formatted = (distinct['address'].astype(object).astype(str).str.strip()
+                         .str.replace(_UNIT_RE, '', regex=True)
+                         .str.replace(_NONWORD_RE, '', regex=True)
+                         .str.replace(_SPACE_RE, '-', regex=True))
+    city_formatted = (distinct['city'].astype(object).astype(str).str.strip()
+                      .str.replace(_NONWORD_RE, '', regex=True)
+                      .str.replace(_SPACE_RE, '-', regex=True))
+    zip_clean = distinct['zip'].astype(object).astype(str).str.strip().str.split('-').str[0]  # Remove ZIP+4 if present
+
+    urls = ZILLOW_URL_BASE + address_formatted + '-' + city_formatted + '-OH-' + zip_clean + '_rb/'
+    urls = urls.astype(object).mask(missing, None).to_numpy()
+    return pd.Series(urls[combination.to_numpy()], index=components.index, dtype=object)
 
 # --- Data Loading Functions ---
 
+def _require_openpyxl():
+    """Exits with an install hint if openpyxl (needed for .xlsx files and hyperlinks) is missing."""
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        raise SystemExit("openpyxl is required to read and write Excel files: pip install openpyxl")
+
+# Columns carried through to the reports but not compared
+MLS_REPORT_COLUMNS = ('Listing #', 'Closed Date')
+CAMA_REPORT_COLUMNS = ('SALEKEY', 'NOPAR', 'ADDITIONAL_PARCELS')
+
+def columns_used(source):
+    """Returns the frozenset of column names read from 'mls' or 'cama' data by the comparison and reports."""
+    side = 'mls_col' if source == 'mls' else 'cama_col'
+    columns = {UNIQUE_ID_COLUMN[side]}
+    columns.update(getattr(mapping, side) for mapping in COLUMNS_TO_COMPARE)
+    columns.update(getattr(mapping, side) for mapping in COLUMNS_TO_COMPARE_CATEGORICAL)
+    if source == 'mls':
+        columns.update(mapping.mls_col for mapping in COLUMNS_TO_COMPARE_SUM)
+        columns.update(MLS_REPORT_COLUMNS)
+        columns.update(ADDRESS_COLUMNS.values())
+    else:
+        for mapping in COLUMNS_TO_COMPARE_SUM:
+            columns.update(mapping.cama_cols)
+        columns.update(CAMA_REPORT_COLUMNS)
+    return frozenset(columns)
+
+def load_or_cache(file_path, columns=None, dtype=None):
+    """
+    Reads an Excel file, caching the parsed sheet as Parquet next to the source.
+
+    The cache (file_path + '.parquet') is reused while it is newer than the source
+    file, so later runs skip the Excel parse entirely. Only the requested columns
+    are returned; the cache keeps every column so editing the configuration never
+    requires rebuilding it.
+
+    dtype maps column names to the types they are parsed as. If a column holds
+    values that cannot be converted (e.g. text in a numeric field), the file is
+    re-read with only the string types applied.
+    """
+    cache_path = file_path + '.parquet'
+    source_mtime = os.path.getmtime(file_path)
+
+    if HAS_PYARROW and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= source_mtime:
+        cached_columns = pq.read_schema(cache_path).names
+        if columns is not None:
+            cached_columns = [col for col in cached_columns if col in columns]
+        # Text comes back as Arrow-backed strings (TEXT_DTYPE), not the default Python-backed storage
+        text_type = pd.StringDtype('pyarrow')
+        return pq.read_table(cache_path, columns=cached_columns).to_pandas(
+            types_mapper={pa.string(): text_type, pa.large_string(): text_type}.get)
+
+    if HAS_CALAMINE:
+        engine = 'calamine'
+    else:
+        engine = 'openpyxl' if file_path.lower().endswith(('.xlsx', '.xlsm')) else None
+    try:
+        df = pd.read_excel(file_path, engine=engine, dtype=dtype)
+    except ValueError as e:
+        if dtype is None:
+            raise
+        # Keep the text columns (parcel IDs) typed; only the numeric columns fall back to inference
+        text_dtype = {col: col_type for col, col_type in dtype.items()
+                      if pd.api.types.is_string_dtype(pd.api.types.pandas_dtype(col_type))}
+        print(f"Note: {e}; reading {file_path} with inferred numeric column types")
+        df = pd.read_excel(file_path, engine=engine, dtype=text_dtype)
+
+    if HAS_PYARROW:
+        # Parquet rejects object columns of mixed types (e.g. ZIP codes read as both int and str), so
+        # they are stored as text; the returned frame gets the same types a cached run reads back
+        object_columns = {col: TEXT_DTYPE for col in df.columns if df[col].dtype == object}
+        df = df.astype(object_columns)
+        try:
+            df.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=False)
+        except Exception as e:
+            print(f"Note: could not cache {file_path} as Parquet ({e})")
+
+    if columns is not None:
+        df = df[[col for col in df.columns if col in columns]]
+    return df
+
 def read_mls_data(file_path):
     """Reads MLS data from a specified Excel file."""
     try:
-        df_mls = pd.read_excel(file_path)
+        df_mls = load_or_cache(file_path, columns_used('mls'), dtype=MLS_DTYPES)
         print(f"Successfully loaded MLS data from: {file_path}")
         return df_mls
     except FileNotFoundError:
@@ -144,7 +311,7 @@ def read_mls_data(file_path):
 def read_cama_data(file_path):
     """Reads CAMA system data from a specified Excel file."""
     try:
-        df_cama = pd.read_excel(file_path)
+        df_cama = load_or_cache(file_path, columns_used('cama'), dtype=CAMA_DTYPES)
         print(f"Successfully loaded CAMA data from: {file_path}")
         return df_cama
     except FileNotFoundError:
@@ -156,13 +323,26 @@ def read_cama_data(file_path):
 
 # --- Data Analysis Functions ---
 
+def _as_id(series):
+    """Casts a parcel ID column to ID_DTYPE; whole-number floats drop their '.0' so 302249.0 matches '302249'."""
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype('Int64')
+    return series.astype(ID_DTYPE)
+
 def find_duplicate_ids(df, id_column, source_name):
     """Finds and reports duplicate IDs within a single DataFrame."""
     if df is None or df.empty:
         print(f"No data to check for duplicates in {source_name}.")
         return pd.DataFrame()
 
-    duplicate_ids = df[df.duplicated(subset=[id_column], keep=False)]
+    # Count each ID once and select the repeated ones, rather than hashing whole-row subsets
+    ids = df[id_column]
+    counts = ids.value_counts()
+    is_duplicate = ids.isin(counts.index[counts > 1])
+    blank_ids = ids.isna()
+    if blank_ids.sum() > 1:
+        is_duplicate |= blank_ids
+    duplicate_ids = df[is_duplicate]
 
     if not duplicate_ids.empty:
         print(f"\n--- Duplicate '{id_column}'s found within {source_name} data ---")
@@ -172,68 +352,137 @@ def find_duplicate_ids(df, id_column, source_name):
         print(f"\nNo duplicate '{id_column}'s found within {source_name} data.")
         return pd.DataFrame()
 
-def values_equal(val1, val2):
-    """Helper function to check if two values are equal using the same logic as main comparison."""
-    try:
-        num1 = pd.to_numeric(val1, errors='raise')
-        num2 = pd.to_numeric(val2, errors='raise')
+def _numeric_array(series, dtype=np.float64):
+    """Converts a column to a contiguous numeric array; blanks and non-numeric values become NaN."""
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=dtype, na_value=np.nan)
 
-        if pd.isna(num1) and pd.isna(num2):
-            return True
-        elif pd.isna(num1) != pd.isna(num2):
-            return False
-        else:
-            return np.isclose(num1, num2, equal_nan=False, rtol=1e-9, atol=NUMERIC_TOLERANCE)
-    except (ValueError, TypeError):
-        str1 = str(val1).strip().lower() if pd.notna(val1) else ''
-        str2 = str(val2).strip().lower() if pd.notna(val2) else ''
-        return str1 == str2
+def _eq_mask(a, b, atol):
+    """Element-wise np.isclose(a, b, rtol=1e-9, atol=atol, equal_nan=True)."""
+    return np.isclose(a, b, rtol=1e-9, atol=atol, equal_nan=True)
 
-def categorical_match(mls_val, cama_val, mapping):
+def _direct_mismatches(mls, cama, atol, skip_zero):
     """
-    Check if a categorical MLS field matches expected CAMA value based on text content.
-
-    Args:
-        mls_val: MLS field value to check for text
-        cama_val: CAMA field value to validate
-        mapping: Dict with comparison rules
-
-    Returns:
-        True if values match expected mapping, False otherwise
+    Mismatch mask of the packed (rows x mappings) float64 matrices: values that are not
+    np.isclose within atol differ, and with skip_zero a 0 on either side is never a mismatch.
     """
-    # Extract mapping rules
-    check_text = mapping.get('mls_check_contains', '')
-    expected_if_true = mapping.get('cama_expected_if_true')
-    expected_if_false = mapping.get('cama_expected_if_false')
-    case_sensitive = mapping.get('case_sensitive', False)
+    out = ~_eq_mask(mls, cama, atol)
+    if skip_zero:
+        out &= (mls != 0) & (cama != 0)
+    return out
+
+def _take_column(df, col, rows, default=''):
+    """Returns the values of col at the given row positions, or default when the column is absent."""
+    if col not in df.columns:
+        return default
+    return df[col].to_numpy()[rows]
+
+def _blank_mask(series, rows):
+    """True at the given row positions where the value is missing or a whitespace-only string."""
+    values = series.iloc[rows]
+    # An owned copy: callers combine further conditions into the mask in place
+    blank = values.isna().to_numpy(dtype=bool, copy=True)
+    if not pd.api.types.is_numeric_dtype(values):
+        blank |= values.astype('string').str.strip().eq('').fillna(False).to_numpy(dtype=bool)
+    return blank
+
+def _text_key(values):
+    """Stripped, lower-cased text of each value: how non-numeric values are compared."""
+    return pd.Series(values, dtype=object).astype(str).str.strip().str.lower().to_numpy()
+
+def _record_fields(df, id_col, rows):
+    """The identifying and address fields of mismatch and perfect-match records at the given row positions."""
+    return {
+        'Parcel_ID': _take_column(df, id_col, rows),
+        'NOPAR': _take_column(df, 'NOPAR', rows),
+        'ADDITIONAL_PARCELS': _take_column(df, 'ADDITIONAL_PARCELS', rows),
+        'Listing_Number': _take_column(df, 'Listing #', rows),
+        'SALEKEY': _take_column(df, 'SALEKEY', rows),
+        'Address': _take_column(df, ADDRESS_COLUMNS.get('address', 'Address'), rows),
+        'City': _take_column(df, ADDRESS_COLUMNS.get('city', 'City'), rows),
+        'State': _take_column(df, ADDRESS_COLUMNS.get('state', 'State or Province'), rows),
+        'Zip': _take_column(df, ADDRESS_COLUMNS.get('zip', 'Postal Code'), rows),
+    }
 
-    # Convert MLS value to string for text searching
-    mls_str = str(mls_val).strip() if pd.notna(mls_val) else ''
+def _mismatch_frame(df, id_col, rows, fields):
+    """
+    Mismatch records of one mapping at the given row positions: the record fields followed by
+    fields (column name -> value or array), with a '_row' column for _concat_by_row.
+    """
+    mismatches = pd.DataFrame(_record_fields(df, id_col, rows))
+    for col, values in fields.items():
+        mismatches[col] = values
+    mismatches.insert(0, '_row', rows)
+    return mismatches
+
+def _concat_by_row(frames):
+    """Concatenates frames carrying a '_row' position column and stably sorts them back into row order."""
+    if not frames:
+        return pd.DataFrame()
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.sort_values('_row', kind='stable').drop(columns='_row').reset_index(drop=True)
 
-    # Apply case sensitivity
-    if not case_sensitive:
-        mls_str = mls_str.lower()
-        check_text = check_text.lower()
+def _sum_cama_cols(df, cols):
+    """
+    Sums several CAMA columns row-wise into one float64 array.
 
-    # Check if text is found in MLS field
-    text_found = check_text in mls_str
+    Blank cells count as 0; a non-numeric value makes that row's sum NaN.
+    The result is accumulated in place, column by column, so the summed
+    columns are never copied into an intermediate sub-frame.
+    """
+    out = np.zeros(len(df), dtype=np.float64)
+    for col in cols:
+        values = _numeric_array(df[col])
+        # Blank cells are skipped (left at 0) rather than zeroed in place: to_numpy() may be a view of df
+        np.add(out, values, out=out, where=~df[col].isna().to_numpy(dtype=bool))
+    return out
+
+def _categorical_text_found(df, mappings):
+    """
+    Evaluates the mls_check_contains test of CatCmp rules for every row.
 
-    # Determine expected CAMA value based on text match
-    expected_cama = expected_if_true if text_found else expected_if_false
+    Args:
+        df: DataFrame holding the MLS columns
+        mappings: Dict of {mapping index: CatCmp}
 
-    # Compare with actual CAMA value
-    try:
-        cama_numeric = pd.to_numeric(cama_val, errors='coerce')
-        expected_numeric = pd.to_numeric(expected_cama, errors='coerce')
+    Returns:
+        Dict of {mapping index: boolean array}, True where the MLS column contains the rule's text
 
-        if pd.isna(cama_numeric) and pd.isna(expected_numeric):
-            return True
-        elif pd.isna(cama_numeric) or pd.isna(expected_numeric):
-            return False
-        else:
-            return np.isclose(cama_numeric, expected_numeric, equal_nan=False, rtol=1e-9, atol=NUMERIC_TOLERANCE)
-    except:
-        return str(cama_val).strip().lower() == str(expected_cama).strip().lower()
+    Rules that share an MLS column are scanned together: one compiled alternation of all
+    their texts finds the rows that can match any rule, and each rule's own test then only
+    runs on those candidate rows instead of the whole column.
+    """
+    rules_by_column = {}
+    for mapping_idx, mapping in mappings.items():
+        rules_by_column.setdefault(mapping.mls_col, []).append(mapping_idx)
+
+    text_found = {}
+    for mls_col, mapping_idxs in rules_by_column.items():
+        text = df[mls_col].astype('string')
+        candidates = None
+        if len(mapping_idxs) > 1:
+            rules = [mappings[mapping_idx] for mapping_idx in mapping_idxs]
+            flags = 0 if all(rule.case_sensitive for rule in rules) else re.IGNORECASE
+            pattern = re.compile('|'.join(re.escape(rule.mls_check_contains) for rule in rules), flags)
+            candidates = text.str.contains(pattern, na=False).to_numpy(dtype=bool)
+            text = text[candidates]
+
+        # Case-insensitive rules search a column lower-cased once, for a lower-cased needle
+        lowered = None
+        for mapping_idx in mapping_idxs:
+            mapping = mappings[mapping_idx]
+            if mapping.case_sensitive:
+                haystack, needle = text, mapping.mls_check_contains
+            else:
+                if lowered is None:
+                    lowered = text.str.lower()
+                haystack, needle = lowered, mapping.mls_check_contains.lower()
+            found = haystack.str.contains(needle, regex=False, na=False).to_numpy(dtype=bool)
+            if candidates is not None:
+                found_all = np.zeros(len(df), dtype=bool)
+                found_all[candidates] = found
+                found = found_all
+            text_found[mapping_idx] = found
+    return text_found
 
 # --- Enhanced Data Comparison Function ---
 
@@ -241,15 +490,17 @@ def compare_data_enhanced(df_mls, df_cama, unique_id_col, cols_to_compare_mappin
                          cols_to_compare_sum=None, cols_to_compare_categorical=None, debug_mode=False):
     """
     Compares MLS and CAMA dataframes with enhanced mismatch reporting.
-    Returns separate DataFrames for different discrepancy types AND perfect matches.
+    Returns separate DataFrames for different discrepancy types AND perfect matches; the matched
+    records are returned as a pd.Index of their CAMA IDs (one entry per joined row), so the joined
+    frame itself is freed once the comparison is done.
 
     Args:
         df_mls: MLS DataFrame
         df_cama: CAMA DataFrame
         unique_id_col: Dict with 'mls_col' and 'cama_col' keys
-        cols_to_compare_mapping: List of dicts for 1-to-1 column comparisons
-        cols_to_compare_sum: List of dicts with 'mls_col' and 'cama_cols' (list) for sum comparisons
-        cols_to_compare_categorical: List of dicts for categorical comparisons
+        cols_to_compare_mapping: Sequence of DirectCmp for 1-to-1 column comparisons
+        cols_to_compare_sum: Sequence of SumCmp (mls_col compared to the sum of cama_cols)
+        cols_to_compare_categorical: Sequence of CatCmp for categorical comparisons
         debug_mode: Boolean for debug output
     """
     if df_mls is None or df_cama is None:
@@ -266,11 +517,7 @@ def compare_data_enhanced(df_mls, df_cama, unique_id_col, cols_to_compare_mappin
         print("Error: Unique ID column mapping is incomplete or invalid.")
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
-    # Rename MLS unique ID column to match CAMA for merging
-    if mls_id_col_name in df_mls.columns:
-        df_mls_renamed = df_mls.copy()
-        df_mls_renamed = df_mls_renamed.rename(columns={mls_id_col_name: cama_id_col_name})
-    else:
+    if mls_id_col_name not in df_mls.columns:
         print(f"Error: Unique ID column '{mls_id_col_name}' not found in MLS data.")
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
@@ -278,506 +525,463 @@ def compare_data_enhanced(df_mls, df_cama, unique_id_col, cols_to_compare_mappin
         print(f"Error: Unique ID column '{cama_id_col_name}' not found in CAMA data.")
         return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
-    # Perform merges - NOTE: No overlapping column names means NO SUFFIXES are added!
-    matched_df = pd.merge(df_mls_renamed, df_cama, on=cama_id_col_name, how='inner')
-    merged_df = pd.merge(df_mls_renamed, df_cama, on=cama_id_col_name, how='outer', indicator=True)
-
-    # Lists to store different types of discrepancies
-    missing_in_cama = []
-    missing_in_mls = []
-    value_mismatches = []
-    perfect_matches = []
-
-    comparison_debug = []
-
-    # Iterate through the merged DataFrame
-    for index, row in merged_df.iterrows():
-        record_id = row.get(cama_id_col_name)
-        merge_status = row.get('_merge')
-
-        if merge_status == 'left_only':
-            # Extract Listing # and Closed Date from MLS data
-            listing_num = row.get('Listing #', '')
-            closed_date = row.get('Closed Date', '')
-
-            missing_in_cama.append({
-                'Parcel_ID': record_id,
-                'Listing_Number': listing_num,
-                'Closed_Date': closed_date
-            })
-
-        elif merge_status == 'right_only':
-            missing_in_mls.append({'Parcel_ID': record_id})
-
-        elif merge_status == 'both':
-            # Extract Listing #, SALEKEY, NOPAR, and ADDITIONAL_PARCELS once for this record
-            listing_num = row.get('Listing #', '')
-            salekey = row.get('SALEKEY', '')
-            nopar = row.get('NOPAR', '')
-            additional_parcels = row.get('ADDITIONAL_PARCELS', '')
-            
-            # Extract address components for Zillow links
-            address = row.get(ADDRESS_COLUMNS.get('address', 'Address'), '')
-            city = row.get(ADDRESS_COLUMNS.get('city', 'City'), '')
-            state = row.get(ADDRESS_COLUMNS.get('state', 'State or Province'), '')
-            zip_code = row.get(ADDRESS_COLUMNS.get('zip', 'Postal Code'), '')
-            
-            record_mismatches = []
-            fields_compared = []
-
-            # Standard 1-to-1 comparisons
-            for mapping in cols_to_compare_mapping:
-                mls_original_col = mapping['mls_col']
-                cama_original_col = mapping['cama_col']
-
-                mls_val_col = mls_original_col
-                cama_val_col = cama_original_col
-
-                if mls_val_col not in merged_df.columns or cama_val_col not in merged_df.columns:
-                    if debug_mode:
-                        print(f"⚠ Column not found in merged data: {mls_val_col} or {cama_val_col}")
-                    continue
-
-                mls_val = row.get(mls_val_col)
-                cama_val = row.get(cama_val_col)
-
-                # SKIP comparison if EITHER value is blank/null/NaN
-                mls_is_blank = pd.isna(mls_val) or (isinstance(mls_val, str) and mls_val.strip() == '')
-                cama_is_blank = pd.isna(cama_val) or (isinstance(cama_val, str) and cama_val.strip() == '')
-
-                if mls_is_blank or cama_is_blank:
-                    continue
-
-                # Track that we compared this field
-                fields_compared.append(mls_original_col)
-
-                # SKIP comparison if EITHER value is 0 and SKIP_ZERO_VALUES is enabled
-                if SKIP_ZERO_VALUES:
-                    try:
-                        mls_numeric = pd.to_numeric(mls_val, errors='coerce')
-                        cama_numeric = pd.to_numeric(cama_val, errors='coerce')
-                        if (pd.notna(mls_numeric) and mls_numeric == 0) or (pd.notna(cama_numeric) and cama_numeric == 0):
-                            continue
-                    except:
-                        pass
-
-                is_different = not values_equal(mls_val, cama_val)
-
-                if debug_mode:
-                    comparison_debug.append({
-                        'Parcel_ID': record_id,
-                        'Field': mls_original_col,
-                        'MLS_Value': mls_val,
-                        'CAMA_Value': cama_val,
-                        'Is_Different': is_different,
-                        'MLS_Type': type(mls_val).__name__,
-                        'CAMA_Type': type(cama_val).__name__
-                    })
-
-                if is_different:
-                    record_mismatches.append({
-                        'Parcel_ID': record_id,
-                        'NOPAR': nopar,
-                        'ADDITIONAL_PARCELS': additional_parcels,
-                        'Listing_Number': listing_num,
-                        'SALEKEY': salekey,
-                        'Address': address,
-                        'City': city,
-                        'State': state,
-                        'Zip': zip_code,
-                        'Field_MLS': mls_original_col,
-                        'Field_CAMA': cama_original_col,
-                        'MLS_Value': mls_val,
-                        'CAMA_Value': cama_val,
-                        'Difference': calculate_difference(mls_val, cama_val),
-                        'Zillow_URL': format_zillow_url(address, city, state, zip_code)
-                    })
-
-            # Handle sum comparisons (multiple CAMA columns summed)
-            if cols_to_compare_sum:
-                for mapping in cols_to_compare_sum:
-                    mls_col = mapping['mls_col']
-                    cama_cols = mapping['cama_cols']
-
-                    # Check if MLS column exists
-                    if mls_col not in merged_df.columns:
-                        if debug_mode:
-                            print(f"⚠ MLS column not found: {mls_col}")
-                        continue
-
-                    # Check if all CAMA columns exist
-                    missing_cols = [col for col in cama_cols if col not in merged_df.columns]
-                    if missing_cols:
-                        if debug_mode:
-                            print(f"⚠ CAMA columns not found: {missing_cols}")
-                        continue
-
-                    mls_val = row.get(mls_col)
-
-                    # Skip if MLS value is blank
-                    mls_is_blank = pd.isna(mls_val) or (isinstance(mls_val, str) and mls_val.strip() == '')
-                    if mls_is_blank:
-                        continue
-
-                    # Calculate sum of CAMA columns (treating NaN as 0)
-                    cama_sum = 0
-                    all_cama_blank = True
-                    for col in cama_cols:
-                        val = row.get(col)
-                        if pd.notna(val):
-                            all_cama_blank = False
-                            try:
-                                cama_sum += pd.to_numeric(val, errors='coerce')
-                            except:
-                                pass
-
-                    # Skip if all CAMA columns are blank
-                    if all_cama_blank:
-                        continue
-
-                    # Track that we compared this field
-                    fields_compared.append(mls_col)
-
-                    # Skip if SKIP_ZERO_VALUES enabled and either side is 0
-                    if SKIP_ZERO_VALUES:
-                        try:
-                            mls_numeric = pd.to_numeric(mls_val, errors='coerce')
-                            if (pd.notna(mls_numeric) and mls_numeric == 0) or cama_sum == 0:
-                                continue
-                        except:
-                            pass
-
-                    # Compare MLS value to CAMA sum
-                    is_different = not values_equal(mls_val, cama_sum)
-
-                    if debug_mode:
-                        comparison_debug.append({
-                            'Parcel_ID': record_id,
-                            'Field': mls_col,
-                            'MLS_Value': mls_val,
-                            'CAMA_Value': f"SUM({','.join(cama_cols)})={cama_sum}",
-                            'Is_Different': is_different,
-                            'MLS_Type': type(mls_val).__name__,
-                            'CAMA_Type': 'float (sum)'
-                        })
-
-                    if is_different:
-                        record_mismatches.append({
-                            'Parcel_ID': record_id,
-                            'NOPAR': nopar,
-                            'ADDITIONAL_PARCELS': additional_parcels,
-                            'Listing_Number': listing_num,
-                            'SALEKEY': salekey,
-                            'Address': address,
-                            'City': city,
-                            'State': state,
-                            'Zip': zip_code,
-                            'Field_MLS': mls_col,
-                            'Field_CAMA': f"SUM({', '.join(cama_cols)})",
-                            'MLS_Value': mls_val,
-                            'CAMA_Value': cama_sum,
-                            'Difference': calculate_difference(mls_val, cama_sum),
-                            'Zillow_URL': format_zillow_url(address, city, state, zip_code)
-                        })
-
-            # Handle categorical comparisons
-            if cols_to_compare_categorical:
-                for mapping in cols_to_compare_categorical:
-                    mls_col = mapping['mls_col']
-                    cama_col = mapping['cama_col']
-
-                    # Check if columns exist
-                    if mls_col not in merged_df.columns:
-                        if debug_mode:
-                            print(f"⚠ MLS column not found: {mls_col}")
-                        continue
-
-                    if cama_col not in merged_df.columns:
-                        if debug_mode:
-                            print(f"⚠ CAMA column not found: {cama_col}")
-                        continue
-
-                    mls_val = row.get(mls_col)
-                    cama_val = row.get(cama_col)
-
-                    # Skip if MLS value is blank
-                    mls_is_blank = pd.isna(mls_val) or (isinstance(mls_val, str) and mls_val.strip() == '')
-                    if mls_is_blank:
-                        continue
-
-                    # Skip if CAMA value is blank
-                    cama_is_blank = pd.isna(cama_val) or (isinstance(cama_val, str) and cama_val.strip() == '')
-                    if cama_is_blank:
-                        continue
-
-                    # Track that we compared this field
-                    fields_compared.append(mls_col)
-
-                    # Perform categorical comparison
-                    is_match = categorical_match(mls_val, cama_val, mapping)
-
-                    # Determine expected value for reporting
-                    check_text = mapping.get('mls_check_contains', '')
-                    case_sensitive = mapping.get('case_sensitive', False)
-                    mls_str = str(mls_val).strip() if pd.notna(mls_val) else ''
-                    if not case_sensitive:
-                        mls_str = mls_str.lower()
-                        check_text_lower = check_text.lower()
-                    else:
-                        check_text_lower = check_text
-                    text_found = check_text_lower in mls_str
-                    expected_cama = mapping.get('cama_expected_if_true') if text_found else mapping.get('cama_expected_if_false')
-
-                    if debug_mode:
-                        comparison_debug.append({
-                            'Parcel_ID': record_id,
-                            'Field': mls_col,
-                            'MLS_Value': mls_val,
-                            'CAMA_Value': cama_val,
-                            'Is_Different': not is_match,
-                            'MLS_Type': type(mls_val).__name__,
-                            'CAMA_Type': type(cama_val).__name__,
-                            'Expected_CAMA': expected_cama
-                        })
-
-                    if not is_match:
-                        record_mismatches.append({
-                            'Parcel_ID': record_id,
-                            'NOPAR': nopar,
-                            'ADDITIONAL_PARCELS': additional_parcels,
-                            'Listing_Number': listing_num,
-                            'SALEKEY': salekey,
-                            'Address': address,
-                            'City': city,
-                            'State': state,
-                            'Zip': zip_code,
-                            'Field_MLS': mls_col,
-                            'Field_CAMA': cama_col,
-                            'MLS_Value': mls_val,
-                            'CAMA_Value': cama_val,
-                            'Expected_CAMA_Value': expected_cama,
-                            'Match_Rule': f"If '{check_text}' in {mls_col}, then {cama_col} should be {mapping.get('cama_expected_if_true')}, else {mapping.get('cama_expected_if_false')}",
-                            'Zillow_URL': format_zillow_url(address, city, state, zip_code)
-                        })
-
-            # If no mismatches found for this record, it's a perfect match!
-            if not record_mismatches and fields_compared:
-                perfect_matches.append({
-                    'Parcel_ID': record_id,
-                    'NOPAR': nopar,
-                    'ADDITIONAL_PARCELS': additional_parcels,
-                    'Listing_Number': listing_num,
-                    'SALEKEY': salekey,
-                    'Address': address,
-                    'City': city,
-                    'State': state,
-                    'Zip': zip_code,
-                    'Fields_Compared': len(fields_compared),
-                    'Fields_List': ', '.join(fields_compared),
-                    'Zillow_URL': format_zillow_url(address, city, state, zip_code)
-                })
-
-            value_mismatches.extend(record_mismatches)
-
-    # Convert to DataFrames
-    df_missing_cama = pd.DataFrame(missing_in_cama)
-    df_missing_mls = pd.DataFrame(missing_in_mls)
-    df_value_mismatches = pd.DataFrame(value_mismatches)
-    df_perfect_matches = pd.DataFrame(perfect_matches)
-
-    if debug_mode and comparison_debug:
-        print(f"\n🔍 DEBUG: Total comparisons made: {len(comparison_debug)}")
-        print(f"🔍 DEBUG: Mismatches detected: {sum(1 for c in comparison_debug if c['Is_Different'])}")
-
-        df_debug = pd.DataFrame(comparison_debug).head(20)
+    # Give both ID columns the same Arrow-backed string dtype so they factorize into one code space
+    # (the loaders already read the IDs as ID_DTYPE, so normally neither frame is copied here)
+    if df_mls[mls_id_col_name].dtype != ID_DTYPE:
+        df_mls = df_mls.assign(**{mls_id_col_name: _as_id(df_mls[mls_id_col_name])})
+    if df_cama[cama_id_col_name].dtype != ID_DTYPE:
+        df_cama = df_cama.assign(**{cama_id_col_name: _as_id(df_cama[cama_id_col_name])})
+
+    # Factorize both ID columns together once and join on the int64 codes: the outer merge hashes
+    # small integer key frames instead of every parcel ID string, and its indicator sorts each row
+    # into matched / missing-in-CAMA / missing-in-MLS. Only the matched rows are then gathered
+    # from the two frames; the MLS copy of the key is dropped.
+    id_codes, _ = pd.factorize(pd.concat([df_mls[mls_id_col_name], df_cama[cama_id_col_name]], ignore_index=True),
+                               use_na_sentinel=False)
+    keys = pd.merge(pd.DataFrame({'_k': id_codes[:len(df_mls)], '_mls_row': np.arange(len(df_mls))}),
+                    pd.DataFrame({'_k': id_codes[len(df_mls):], '_cama_row': np.arange(len(df_cama))}),
+                    on='_k', how='outer', indicator=True)
+    side = keys['_merge'].to_numpy()
+    both = side == 'both'
+    left_rows = keys['_mls_row'].to_numpy()[side == 'left_only'].astype(np.intp)
+    right_rows = keys['_cama_row'].to_numpy()[side == 'right_only'].astype(np.intp)
+
+    mls_part = df_mls.take(keys['_mls_row'].to_numpy()[both].astype(np.intp))
+    if mls_id_col_name != cama_id_col_name:
+        del mls_part[mls_id_col_name]
+    cama_part = df_cama.take(keys['_cama_row'].to_numpy()[both].astype(np.intp))
+    if mls_id_col_name == cama_id_col_name:
+        del cama_part[cama_id_col_name]
+    # NOTE: No overlapping column names means NO SUFFIXES are needed!
+    merged_df = pd.concat([mls_part.reset_index(drop=True), cama_part.reset_index(drop=True)], axis=1)
+    del keys, mls_part, cama_part
+    matched_rows = np.arange(len(merged_df))
+
+    # Mismatch and debug records are collected per mapping as frames
+    mismatch_frames = []
+    debug_frames = []
+
+    # Compare the 1-to-1 columns on two packed (rows x mappings) float64 matrices in column-major
+    # order, so one fused pass computes every mapping's mismatches and each column stays contiguous.
+    direct_columns = {}
+    for mapping_idx, mapping in enumerate(cols_to_compare_mapping):
+        if mapping.mls_col in merged_df.columns and mapping.cama_col in merged_df.columns:
+            direct_columns[mapping_idx] = len(direct_columns)
+
+    mls_matrix = np.empty((len(merged_df), len(direct_columns)), dtype=np.float64, order='F')
+    cama_matrix = np.empty_like(mls_matrix)
+    for mapping_idx, col_idx in direct_columns.items():
+        mapping = cols_to_compare_mapping[mapping_idx]
+        mls_matrix[:, col_idx] = _numeric_array(merged_df[mapping.mls_col])
+        cama_matrix[:, col_idx] = _numeric_array(merged_df[mapping.cama_col])
+
+    # SKIP_ZERO_VALUES: rows where EITHER value is 0 are never compared
+    mismatch_matrix = _direct_mismatches(mls_matrix, cama_matrix, NUMERIC_TOLERANCE, SKIP_ZERO_VALUES)
+    zero_matrix = (mls_matrix == 0) | (cama_matrix == 0)
+
+    # Sum the CAMA columns of each sum mapping once, up front, rather than per row, and compare
+    # every sum to its MLS value in one pass (a non-numeric MLS value never equals a sum)
+    cama_sums = {}
+    sum_zero_skipped = {}
+    sum_mismatch = {}
+    if cols_to_compare_sum:
+        for mapping_idx, mapping in enumerate(cols_to_compare_sum):
+            if mapping.mls_col in merged_df.columns and all(col in merged_df.columns for col in mapping.cama_cols):
+                cama_sums[mapping_idx] = _sum_cama_cols(merged_df, mapping.cama_cols)
+                mls_numeric = _numeric_array(merged_df[mapping.mls_col])
+                sum_zero_skipped[mapping_idx] = (mls_numeric == 0) | (cama_sums[mapping_idx] == 0)
+                sum_mismatch[mapping_idx] = (~_eq_mask(mls_numeric, cama_sums[mapping_idx], NUMERIC_TOLERANCE)
+                                             | np.isnan(mls_numeric))
+
+    # Evaluate each categorical rule for all rows at once: expected CAMA values and a mismatch mask
+    categorical_mappings = {mapping_idx: mapping
+                            for mapping_idx, mapping in enumerate(cols_to_compare_categorical or ())
+                            if mapping.mls_col in merged_df.columns and mapping.cama_col in merged_df.columns}
+    categorical_text_found = _categorical_text_found(merged_df, categorical_mappings)
+    categorical_expected = {}
+    categorical_mismatch = {}
+    for mapping_idx, mapping in categorical_mappings.items():
+        expected = np.where(categorical_text_found[mapping_idx], mapping.cama_expected_if_true,
+                            mapping.cama_expected_if_false).astype(np.int8)
+        cama_numeric = _numeric_array(merged_df[mapping.cama_col])
+        categorical_expected[mapping_idx] = expected
+        categorical_mismatch[mapping_idx] = ~_eq_mask(cama_numeric, expected.astype(np.float64), NUMERIC_TOLERANCE)
+
+    # Pull the unmatched records by row position in one vectorized take instead of per-row lookups
+    df_missing_cama = pd.DataFrame({
+        'Parcel_ID': _take_column(df_mls, mls_id_col_name, left_rows),
+        'Listing_Number': _take_column(df_mls, 'Listing #', left_rows),
+        'Closed_Date': _take_column(df_mls, 'Closed Date', left_rows),
+    })
+    df_missing_mls = pd.DataFrame({'Parcel_ID': _take_column(df_cama, cama_id_col_name, right_rows)})
+
+    # Build the Zillow URL of every matched record in one vectorized pass (absent columns read as '')
+    matched_address = {key: (merged_df[col].iloc[matched_rows] if col in merged_df.columns
+                             else pd.Series('', index=merged_df.index[matched_rows]))
+                       for key, col in (('address', ADDRESS_COLUMNS.get('address', 'Address')),
+                                        ('city', ADDRESS_COLUMNS.get('city', 'City')),
+                                        ('zip', ADDRESS_COLUMNS.get('zip', 'Postal Code')))}
+    zillow_urls = zillow_url_column(matched_address['address'], matched_address['city'],
+                                    matched_address['zip']).to_numpy()
+
+    # Standard 1-to-1 comparisons, one column at a time over all matched rows. Numeric pairs are
+    # read from mismatch_matrix; pairs where either value is not numeric fall back to comparing
+    # their stripped, lower-cased text.
+    # compared_fields holds (field name, rows compared) per mapping, in report order
+    compared_fields = []
+    any_mismatch = np.zeros(len(matched_rows), dtype=bool)
+    for mapping_idx, mapping in enumerate(cols_to_compare_mapping):
+        if mapping_idx not in direct_columns:
+            if debug_mode:
+                print(f"⚠ Column not found in merged data: {mapping.mls_col} or {mapping.cama_col}")
+            continue
+        col_idx = direct_columns[mapping_idx]
+
+        mls_vals = _take_column(merged_df, mapping.mls_col, matched_rows)
+        cama_vals = _take_column(merged_df, mapping.cama_col, matched_rows)
+
+        # SKIP comparison if EITHER value is blank/null/NaN
+        compared = ~(_blank_mask(merged_df[mapping.mls_col], matched_rows)
+                     | _blank_mask(merged_df[mapping.cama_col], matched_rows))
+        compared_fields.append((mapping.mls_col, compared))
+
+        # SKIP comparison if EITHER value is 0 and SKIP_ZERO_VALUES is enabled
+        checked = compared & ~zero_matrix[matched_rows, col_idx] if SKIP_ZERO_VALUES else compared
+
+        is_different = mismatch_matrix[matched_rows, col_idx]
+        text_rows = checked & (np.isnan(mls_matrix[matched_rows, col_idx]) | np.isnan(cama_matrix[matched_rows, col_idx]))
+        if text_rows.any():
+            is_different[text_rows] = _text_key(mls_vals[text_rows]) != _text_key(cama_vals[text_rows])
+        is_different &= checked
+        any_mismatch |= is_different
+
+        if debug_mode:
+            debug_frames.append(pd.DataFrame({
+                '_row': matched_rows[checked],
+                'Parcel_ID': _take_column(merged_df, cama_id_col_name, matched_rows[checked]),
+                'Field': mapping.mls_col,
+                'MLS_Value': mls_vals[checked],
+                'CAMA_Value': cama_vals[checked],
+                'Is_Different': is_different[checked],
+                'MLS_Type': [type(val).__name__ for val in mls_vals[checked]],
+                'CAMA_Type': [type(val).__name__ for val in cama_vals[checked]],
+            }))
+
+        if is_different.any():
+            mismatch_frames.append(_mismatch_frame(merged_df, cama_id_col_name, matched_rows[is_different], {
+                'Field_MLS': mapping.mls_col,
+                'Field_CAMA': mapping.cama_col,
+                'MLS_Value': mls_vals[is_different],
+                'CAMA_Value': cama_vals[is_different],
+                'Difference': difference_column(mls_vals[is_different], cama_vals[is_different]),
+                'Zillow_URL': zillow_urls[is_different],
+            }))
+
+    # Resolve which sum/categorical mappings can run, their values on the matched rows and the rows
+    # they skip (blank values) once, rather than re-checking the columns for every record
+    valid_sum_mappings = []
+    for mapping_idx, mapping in enumerate(cols_to_compare_sum or ()):
+        if mapping.mls_col not in merged_df.columns:
+            if debug_mode:
+                print(f"⚠ MLS column not found: {mapping.mls_col}")
+            continue
+        missing_cols = [col for col in mapping.cama_cols if col not in merged_df.columns]
+        if missing_cols:
+            if debug_mode:
+                print(f"⚠ CAMA columns not found: {missing_cols}")
+            continue
+        # Skip if MLS value is blank, or if all CAMA columns are blank
+        skipped = _blank_mask(merged_df[mapping.mls_col], matched_rows)
+        skipped |= np.logical_and.reduce([merged_df[col].isna().to_numpy(dtype=bool)[matched_rows]
+                                          for col in mapping.cama_cols])
+        valid_sum_mappings.append((mapping_idx, mapping, _take_column(merged_df, mapping.mls_col, matched_rows), skipped))
+
+    # Sum comparisons, one mapping at a time over all matched rows
+    for mapping_idx, mapping, mls_values, skipped in valid_sum_mappings:
+        compared = ~skipped
+        compared_fields.append((mapping.mls_col, compared))
+
+        # Skip if SKIP_ZERO_VALUES enabled and either side is 0
+        checked = compared & ~sum_zero_skipped[mapping_idx][matched_rows] if SKIP_ZERO_VALUES else compared
+        is_different = sum_mismatch[mapping_idx][matched_rows] & checked
+        any_mismatch |= is_different
+        sums = cama_sums[mapping_idx][matched_rows]
+
+        if debug_mode:
+            debug_frames.append(pd.DataFrame({
+                '_row': matched_rows[checked],
+                'Parcel_ID': _take_column(merged_df, cama_id_col_name, matched_rows[checked]),
+                'Field': mapping.mls_col,
+                'MLS_Value': mls_values[checked],
+                'CAMA_Value': [f"SUM({','.join(mapping.cama_cols)})={cama_sum}" for cama_sum in sums[checked]],
+                'Is_Different': is_different[checked],
+                'MLS_Type': [type(val).__name__ for val in mls_values[checked]],
+                'CAMA_Type': 'float (sum)',
+            }))
+
+        if is_different.any():
+            mismatch_frames.append(_mismatch_frame(merged_df, cama_id_col_name, matched_rows[is_different], {
+                'Field_MLS': mapping.mls_col,
+                'Field_CAMA': f"SUM({', '.join(mapping.cama_cols)})",
+                'MLS_Value': mls_values[is_different],
+                'CAMA_Value': sums[is_different],
+                'Difference': difference_column(mls_values[is_different], sums[is_different]),
+                'Zillow_URL': zillow_urls[is_different],
+            }))
+
+    valid_categorical_mappings = []
+    for mapping_idx, mapping in enumerate(cols_to_compare_categorical or ()):
+        if mapping.mls_col not in merged_df.columns:
+            if debug_mode:
+                print(f"⚠ MLS column not found: {mapping.mls_col}")
+            continue
+        if mapping.cama_col not in merged_df.columns:
+            if debug_mode:
+                print(f"⚠ CAMA column not found: {mapping.cama_col}")
+            continue
+        # Skip if either value is blank
+        skipped = (_blank_mask(merged_df[mapping.mls_col], matched_rows)
+                   | _blank_mask(merged_df[mapping.cama_col], matched_rows))
+        valid_categorical_mappings.append((mapping_idx, mapping,
+                                           _take_column(merged_df, mapping.mls_col, matched_rows),
+                                           _take_column(merged_df, mapping.cama_col, matched_rows), skipped))
+
+    # Categorical comparisons, one rule at a time over all matched rows
+    for mapping_idx, mapping, mls_values, cama_values, skipped in valid_categorical_mappings:
+        compared = ~skipped
+        compared_fields.append((mapping.mls_col, compared))
+
+        is_different = categorical_mismatch[mapping_idx][matched_rows] & compared
+        any_mismatch |= is_different
+        expected = categorical_expected[mapping_idx][matched_rows]
+
+        if debug_mode:
+            debug_frames.append(pd.DataFrame({
+                '_row': matched_rows[compared],
+                'Parcel_ID': _take_column(merged_df, cama_id_col_name, matched_rows[compared]),
+                'Field': mapping.mls_col,
+                'MLS_Value': mls_values[compared],
+                'CAMA_Value': cama_values[compared],
+                'Is_Different': is_different[compared],
+                'MLS_Type': [type(val).__name__ for val in mls_values[compared]],
+                'CAMA_Type': [type(val).__name__ for val in cama_values[compared]],
+                'Expected_CAMA': expected[compared],
+            }))
+
+        if is_different.any():
+            mismatch_frames.append(_mismatch_frame(merged_df, cama_id_col_name, matched_rows[is_different], {
+                'Field_MLS': mapping.mls_col,
+                'Field_CAMA': mapping.cama_col,
+                'MLS_Value': mls_values[is_different],
+                'CAMA_Value': cama_values[is_different],
+                'Expected_CAMA_Value': expected[is_different],
+                'Match_Rule': f"If '{mapping.mls_check_contains}' in {mapping.mls_col}, then {mapping.cama_col} should be {mapping.cama_expected_if_true}, else {mapping.cama_expected_if_false}",
+                'Zillow_URL': zillow_urls[is_different],
+            }))
+
+    # Perfect matches: records where at least one field was compared and none mismatched.
+    # Fields_List is joined once per distinct combination of compared fields, not once per record.
+    perfect = ~any_mismatch
+    if compared_fields:
+        field_names = np.array([field_name for field_name, _ in compared_fields], dtype=object)
+        fields_matrix = np.column_stack([compared for _, compared in compared_fields])
+        perfect &= fields_matrix.any(axis=1)
+        fields_matrix = fields_matrix[perfect]
+    else:
+        perfect[:] = False
+        field_names = np.array([], dtype=object)
+        fields_matrix = np.zeros((0, 0), dtype=bool)
+    field_sets, field_set_idx = np.unique(fields_matrix, axis=0, return_inverse=True)
+    fields_lists = np.array([', '.join(field_names[field_set]) for field_set in field_sets], dtype=object)
+
+    df_perfect_matches = pd.DataFrame(_record_fields(merged_df, cama_id_col_name, matched_rows[perfect]))
+    df_perfect_matches['Fields_Compared'] = fields_matrix.sum(axis=1)
+    df_perfect_matches['Fields_List'] = fields_lists[field_set_idx.reshape(-1)]
+    df_perfect_matches['Zillow_URL'] = zillow_urls[perfect]
+
+    # Interleave the per-mapping results back into row order
+    df_value_mismatches = _concat_by_row(mismatch_frames)
+
+    df_debug = _concat_by_row(debug_frames)
+    if debug_mode and not df_debug.empty:
+        print(f"\n🔍 DEBUG: Total comparisons made: {len(df_debug)}")
+        print(f"🔍 DEBUG: Mismatches detected: {int(df_debug['Is_Different'].sum())}")
+
+        df_debug = df_debug.head(20)
         print("\n🔍 DEBUG: First 20 comparisons:")
         display(df_debug)
 
-    return df_missing_cama, df_missing_mls, df_value_mismatches, matched_df, df_perfect_matches
+    matched_records = pd.Index(merged_df[cama_id_col_name], name=cama_id_col_name)
 
-def calculate_difference(val1, val2):
-    """Calculate the difference between two values (numeric or text)."""
-    try:
-        num1 = pd.to_numeric(val1, errors='raise')
-        num2 = pd.to_numeric(val2, errors='raise')
+    return df_missing_cama, df_missing_mls, df_value_mismatches, matched_records, df_perfect_matches
 
-        if pd.isna(num1) or pd.isna(num2):
-            return "N/A"
-
-        diff = num1 - num2
-        return f"{diff:,.2f}"
-    except (ValueError, TypeError):
-        return "Text difference"
+def difference_column(values1, values2):
+    """
+    Calculate the difference between two aligned arrays of values (numeric or text).
+    Each entry is "Text difference" where a value is not numeric, "N/A" where either
+    value is missing, and otherwise the difference formatted like "1,234.50".
+    """
+    is_text = np.zeros(len(values1), dtype=bool)
+    numbers = []
+    for values in (values1, values2):
+        values = pd.Series(values, dtype=object)
+        number = pd.to_numeric(values, errors='coerce')
+        # Only missing values and the empty string parse as NaN; anything else that fails is text
+        is_text |= (values.notna() & values.fillna(0).ne('') & number.isna()).to_numpy(dtype=bool)
+        numbers.append(number.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    diff = numbers[0] - numbers[1]
+    result = np.full(len(diff), "N/A", dtype=object)
+    result[is_text] = "Text difference"
+    formatted = ~is_text & ~np.isnan(diff)
+    result[formatted] = [f"{value:,.2f}" for value in diff[formatted]]
+    return result
 
 # --- Enhanced Reporting Function ---
 
+def _has_text(values):
+    """True where a cell value is present and not just whitespace."""
+    present = values.astype(object).where(values.notna(), '')
+    return (present.astype(bool) & present.astype(str).str.strip().ne('')).to_numpy()
+
+def parcel_url_column(parcel_ids):
+    """PARCEL_ID_URL_TEMPLATE filled in for a Series of parcel IDs by concatenating its fixed pieces."""
+    ids = parcel_ids.astype(str)
+    urls = None
+    for piece in PARCEL_ID_URL_TEMPLATE.split('{parcel_id}'):
+        urls = pd.Series(piece, index=parcel_ids.index, dtype=object) if urls is None else urls + ids + piece
+    return urls
+
+def _report_links(df_output):
+    """
+    Returns {column name: array of URLs (None = no link)} for the hyperlinked report columns:
+    Parcel_ID links to iasWorld, Address links to Zillow when City and Zip are present.
+    """
+    links = {}
+    if 'Parcel_ID' in df_output.columns and PARCEL_ID_URL_TEMPLATE:
+        urls = parcel_url_column(df_output['Parcel_ID'])
+        links['Parcel_ID'] = urls.where(_has_text(df_output['Parcel_ID']), None).to_numpy()
+    if 'Address' in df_output.columns and all(col in df_output.columns for col in ['City', 'Zip']):
+        urls = (df_output['Zillow_URL'] if 'Zillow_URL' in df_output.columns
+                else zillow_url_column(df_output['Address'], df_output['City'], df_output['Zip']))
+        links['Address'] = urls.astype(object).where(_has_text(df_output['Address']), None).to_numpy()
+    return links
+
+def _write_report_xlsxwriter(df_output, filename, sheet_name, links):
+    """Streams a report with xlsxwriter in constant_memory mode: each row is flushed once it is complete."""
+    workbook = xlsxwriter.Workbook(filename, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'strings_to_formulas': False,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    worksheet = workbook.add_worksheet(sheet_name)
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    worksheet.write_row(0, 0, list(df_output.columns), header_format)
+
+    link_columns = [(df_output.columns.get_loc(col), urls) for col, urls in links.items()]
+    values = df_output.astype(object).where(df_output.notna(), None)
+    # constant_memory requires rows to be written strictly in order
+    for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_idx, 0, row)
+        for col_idx, urls in link_columns:
+            url = urls[row_idx - 1]
+            if url:
+                worksheet.write_url(row_idx, col_idx, url, string=str(row[col_idx]))
+
+    workbook.close()
+
+def _write_report_openpyxl(df_output, filename, sheet_name, links):
+    """Streams a report with an openpyxl write-only workbook, attaching hyperlinks as each row is appended."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+    from openpyxl.styles.builtins import styles as builtin_styles
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+
+    # Same header look as pandas' to_excel
+    thin = Side(style='thin')
+    header = []
+    for col in df_output.columns:
+        cell = WriteOnlyCell(ws, value=col)
+        cell.font = Font(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal='center', vertical='top')
+        header.append(cell)
+    ws.append(header)
+
+    # Assigning the resolved style object skips the by-name style lookup on every cell
+    hyperlink_style = builtin_styles['Hyperlink']
+    link_columns = [(df_output.columns.get_loc(col), urls) for col, urls in links.items()]
+    values = df_output.astype(object).where(df_output.notna(), None)
+    for row_idx, row in enumerate(values.itertuples(index=False, name=None)):
+        row = list(row)
+        for col_idx, urls in link_columns:
+            if urls[row_idx]:
+                cell = WriteOnlyCell(ws, value=row[col_idx])
+                cell.hyperlink = urls[row_idx]
+                cell.style = hyperlink_style
+                row[col_idx] = cell
+        ws.append(row)
+
+    wb.save(filename)
+
+def _to_arrow_table(df_output):
+    """Converts a report to an Arrow table; mixed-type object columns (e.g. MLS_Value) become strings."""
+    object_columns = {col: 'string' for col in df_output.columns if df_output[col].dtype == object}
+    return pa.Table.from_pandas(df_output.astype(object_columns), preserve_index=False)
+
+def _write_report(df_output, filename, sheet_name):
+    """Writes one report in OUTPUT_FORMAT; xlsx reports get Parcel_ID and Address hyperlinks."""
+    if OUTPUT_FORMAT == 'parquet':
+        pq.write_table(_to_arrow_table(df_output), filename, compression='zstd')
+        return
+    if OUTPUT_FORMAT == 'csv':
+        if HAS_PYARROW:
+            pa_csv.write_csv(_to_arrow_table(df_output), filename)
+        else:
+            df_output.to_csv(filename, index=False)
+        return
+
+    links = _report_links(df_output)
+    if HAS_XLSXWRITER:
+        _write_report_xlsxwriter(df_output, filename, sheet_name, links)
+    else:
+        _write_report_openpyxl(df_output, filename, sheet_name, links)
+
 def report_discrepancies_enhanced(df_missing_cama, df_missing_mls, df_value_mismatches,
                                   df_perfect_matches, output_prefix='discrepancies'):
     """Generates separate reports for each type of discrepancy AND perfect matches with hyperlinks."""
-    from openpyxl.utils import get_column_letter
-    from openpyxl import load_workbook
-    
+    if OUTPUT_FORMAT not in ('xlsx', 'parquet', 'csv'):
+        raise ValueError(f"Unsupported OUTPUT_FORMAT '{OUTPUT_FORMAT}' (expected xlsx, parquet or csv)")
+    if OUTPUT_FORMAT == 'parquet' and not HAS_PYARROW:
+        raise SystemExit("OUTPUT_FORMAT=parquet requires pyarrow: pip install pyarrow")
+
     reports_generated = []
 
     if not df_missing_cama.empty:
-        filename = f"{output_prefix}_missing_in_CAMA.xlsx"
-        df_output = df_missing_cama.copy()
-        
-        # Save to Excel first
-        df_output.to_excel(filename, index=False, sheet_name='Missing in CAMA', engine='openpyxl')
-        
-        # Add hyperlinks using openpyxl
-        if 'Parcel_ID' in df_output.columns and PARCEL_ID_URL_TEMPLATE:
-            wb = load_workbook(filename)
-            ws = wb['Missing in CAMA']
-            
-            # Find Parcel_ID column
-            parcel_col_idx = list(df_output.columns).index('Parcel_ID') + 1
-            
-            # Add hyperlinks to each cell (skip header row)
-            for row_idx in range(2, len(df_output) + 2):
-                cell = ws.cell(row=row_idx, column=parcel_col_idx)
-                parcel_value = cell.value
-                if parcel_value and str(parcel_value).strip():
-                    url = PARCEL_ID_URL_TEMPLATE.format(parcel_id=parcel_value)
-                    cell.hyperlink = url
-                    cell.style = 'Hyperlink'
-            
-            wb.save(filename)
-        
+        filename = f"{output_prefix}_missing_in_CAMA.{OUTPUT_FORMAT}"
+        _write_report(df_missing_cama, filename, 'Missing in CAMA')
         print(f"\n✓ Missing in CAMA report saved: {filename} ({len(df_missing_cama)} records)")
         reports_generated.append(filename)
 
     if not df_missing_mls.empty:
-        filename = f"{output_prefix}_missing_in_MLS.xlsx"
-        df_output = df_missing_mls.copy()
-        
-        # Save to Excel first
-        df_output.to_excel(filename, index=False, sheet_name='Missing in MLS', engine='openpyxl')
-        
-        # Add hyperlinks using openpyxl
-        if 'Parcel_ID' in df_output.columns and PARCEL_ID_URL_TEMPLATE:
-            wb = load_workbook(filename)
-            ws = wb['Missing in MLS']
-            
-            parcel_col_idx = list(df_output.columns).index('Parcel_ID') + 1
-            
-            for row_idx in range(2, len(df_output) + 2):
-                cell = ws.cell(row=row_idx, column=parcel_col_idx)
-                parcel_value = cell.value
-                if parcel_value and str(parcel_value).strip():
-                    url = PARCEL_ID_URL_TEMPLATE.format(parcel_id=parcel_value)
-                    cell.hyperlink = url
-                    cell.style = 'Hyperlink'
-            
-            wb.save(filename)
-        
+        filename = f"{output_prefix}_missing_in_MLS.{OUTPUT_FORMAT}"
+        _write_report(df_missing_mls, filename, 'Missing in MLS')
         print(f"✓ Missing in MLS report saved: {filename} ({len(df_missing_mls)} records)")
         reports_generated.append(filename)
 
     if not df_value_mismatches.empty:
-        filename = f"{output_prefix}_value_mismatches.xlsx"
-        df_output = df_value_mismatches.copy()
-        
-        # Save to Excel first
-        df_output.to_excel(filename, index=False, sheet_name='Value Mismatches', engine='openpyxl')
-        
-        # Add hyperlinks using openpyxl
-        wb = load_workbook(filename)
-        ws = wb['Value Mismatches']
-        
-        # Add Parcel_ID hyperlinks
-        if 'Parcel_ID' in df_output.columns and PARCEL_ID_URL_TEMPLATE:
-            parcel_col_idx = list(df_output.columns).index('Parcel_ID') + 1
-            
-            for row_idx in range(2, len(df_output) + 2):
-                cell = ws.cell(row=row_idx, column=parcel_col_idx)
-                parcel_value = cell.value
-                if parcel_value and str(parcel_value).strip():
-                    url = PARCEL_ID_URL_TEMPLATE.format(parcel_id=parcel_value)
-                    cell.hyperlink = url
-                    cell.style = 'Hyperlink'
-        
-        # Add Zillow hyperlinks to Address column
-        if 'Address' in df_output.columns:
-            address_col_idx = list(df_output.columns).index('Address') + 1
-            
-            # Check if city and zip columns exist
-            has_location_data = all(col in df_output.columns for col in ['City', 'Zip'])
-            
-            if has_location_data:
-                city_col_idx = list(df_output.columns).index('City') + 1
-                zip_col_idx = list(df_output.columns).index('Zip') + 1
-                
-                for row_idx in range(2, len(df_output) + 2):
-                    address_cell = ws.cell(row=row_idx, column=address_col_idx)
-                    address_value = address_cell.value
-                    
-                    if address_value and str(address_value).strip():
-                        # Get city and zip from the same row
-                        city = ws.cell(row=row_idx, column=city_col_idx).value
-                        zip_code = ws.cell(row=row_idx, column=zip_col_idx).value
-                        
-                        url = format_zillow_url(address_value, city, 'OH', zip_code)
-                        if url:
-                            address_cell.hyperlink = url
-                            address_cell.style = 'Hyperlink'
-        
-        wb.save(filename)
-        
+        filename = f"{output_prefix}_value_mismatches.{OUTPUT_FORMAT}"
+        _write_report(df_value_mismatches, filename, 'Value Mismatches')
         print(f"✓ Value Mismatches report saved: {filename} ({len(df_value_mismatches)} mismatches)")
         reports_generated.append(filename)
 
     if not df_perfect_matches.empty:
-        filename = f"{output_prefix}_perfect_matches.xlsx"
-        df_output = df_perfect_matches.copy()
-        
-        # Save to Excel first
-        df_output.to_excel(filename, index=False, sheet_name='Perfect Matches', engine='openpyxl')
-        
-        # Add hyperlinks using openpyxl
-        wb = load_workbook(filename)
-        ws = wb['Perfect Matches']
-        
-        # Add Parcel_ID hyperlinks
-        if 'Parcel_ID' in df_output.columns and PARCEL_ID_URL_TEMPLATE:
-            parcel_col_idx = list(df_output.columns).index('Parcel_ID') + 1
-            
-            for row_idx in range(2, len(df_output) + 2):
-                cell = ws.cell(row=row_idx, column=parcel_col_idx)
-                parcel_value = cell.value
-                if parcel_value and str(parcel_value).strip():
-                    url = PARCEL_ID_URL_TEMPLATE.format(parcel_id=parcel_value)
-                    cell.hyperlink = url
-                    cell.style = 'Hyperlink'
-        
-        # Add Zillow hyperlinks to Address column
-        if 'Address' in df_output.columns:
-            address_col_idx = list(df_output.columns).index('Address') + 1
-            
-            # Check if city and zip columns exist
-            has_location_data = all(col in df_output.columns for col in ['City', 'Zip'])
-            
-            if has_location_data:
-                city_col_idx = list(df_output.columns).index('City') + 1
-                zip_col_idx = list(df_output.columns).index('Zip') + 1
-                
-                for row_idx in range(2, len(df_output) + 2):
-                    address_cell = ws.cell(row=row_idx, column=address_col_idx)
-                    address_value = address_cell.value
-                    
-                    if address_value and str(address_value).strip():
-                        # Get city and zip from the same row
-                        city = ws.cell(row=row_idx, column=city_col_idx).value
-                        zip_code = ws.cell(row=row_idx, column=zip_col_idx).value
-                        
-                        url = format_zillow_url(address_value, city, 'OH', zip_code)
-                        if url:
-                            address_cell.hyperlink = url
-                            address_cell.style = 'Hyperlink'
-        
-        wb.save(filename)
-        
+        filename = f"{output_prefix}_perfect_matches.{OUTPUT_FORMAT}"
+        _write_report(df_perfect_matches, filename, 'Perfect Matches')
         print(f"✓ Perfect Matches report saved: {filename} ({len(df_perfect_matches)} records)")
         reports_generated.append(filename)
 
@@ -789,6 +993,9 @@ def report_discrepancies_enhanced(df_missing_cama, df_missing_mls, df_value_mism
 # --- Main Execution ---
 
 if __name__ == "__main__":
+    # Copy-on-write: frames derived from the loaded data share its buffers until one is written to
+    pd.options.mode.copy_on_write = True
+
     print("="*80)
     print("MLS vs. CAMA Data Comparison - Enhanced Version with Categorical Comparison")
     print("="*80)
@@ -796,6 +1003,9 @@ if __name__ == "__main__":
     DEBUG_MODE = False  # Set to True to see detailed comparison info
     RUN_DIAGNOSTICS = False  # Set to True to run diagnostic analysis
 
+    _require_openpyxl()
+    reports_generated = []
+
     # 1. Load data
     mls_data = read_mls_data(MLS_DATA_PATH)
     cama_data = read_cama_data(CAMA_DATA_PATH)
@@ -811,6 +1021,11 @@ if __name__ == "__main__":
         elif cama_id_col_name not in cama_data.columns:
             print(f"Error: Unique ID column '{cama_id_col_name}' not found in CAMA data.")
         else:
+            # Cast both join keys to ID_DTYPE once, right after loading, so the duplicate check and
+            # the merge work on Arrow-backed strings and compare_data_enhanced has nothing to convert
+            mls_data[mls_id_col_name] = _as_id(mls_data[mls_id_col_name])
+            cama_data[cama_id_col_name] = _as_id(cama_data[cama_id_col_name])
+
             print(f"\n📊 Data Summary:")
             print(f"   MLS records: {len(mls_data)}")
             print(f"   CAMA records: {len(cama_data)}")
@@ -847,36 +1062,35 @@ if __name__ == "__main__":
 
             if not df_value_mismatches.empty:
                 print("\n📊 Mismatches by Field:")
-                mismatch_counts = df_value_mismatches['Field_MLS'].value_counts()
-                for field, count in mismatch_counts.items():
-                    print(f"   {field}: {count} mismatches")
+                mismatch_counts = (df_value_mismatches.groupby('Field_MLS', sort=False).size()
+                                   .sort_values(ascending=False, kind='stable'))
+                # One print of the whole table rather than one per field
+                print(('   ' + mismatch_counts.index.astype(str) + ': '
+                       + mismatch_counts.astype(str).to_numpy() + ' mismatches').str.cat(sep='\n'))
 
             # 5. Generate reports
             print("\n" + "="*80)
             print("STEP 4: Generating CSV Reports")
             print("="*80)
-            report_discrepancies_enhanced(df_missing_cama, df_missing_mls,
-                                         df_value_mismatches, df_perfect_matches)
+            reports_generated = report_discrepancies_enhanced(df_missing_cama, df_missing_mls,
+                                                              df_value_mismatches, df_perfect_matches)
 
     else:
         print("❌ Data loading failed. Please check file paths and formats.")
 
-    print("\n" + "="*80)
-    print("Automation Complete")
-    print("="*80)
-
-    print("\n" + "="*80)
-    print("Script Complete")
-    print("="*80)
+    print("\n" + "="*80 + "\nAutomation Complete\n" + "="*80, flush=True)
 
     # Download all reports if running in Colab
-    try:
+    if IN_COLAB:
         from google.colab import files
-        print("\n📥 Downloading Excel reports...")
-        files.download('discrepancies_missing_in_CAMA.xlsx')
-        files.download('discrepancies_missing_in_MLS.xlsx')
-        files.download('discrepancies_value_mismatches.xlsx')
-        files.download('discrepancies_perfect_matches.xlsx')
-        print("✓ All reports downloaded!")
-    except:
+        if reports_generated:
+            print("\n📥 Downloading reports...")
+            # One zip = one browser download instead of one per report. The reports are already
+            # compressed (xlsx/parquet), so the fastest deflate level loses next to nothing.
+            with zipfile.ZipFile('discrepancies.zip', 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+                for filename in reports_generated:
+                    archive.write(filename)
+            files.download('discrepancies.zip')
+            print("✓ All reports downloaded!")
+    else:
         print("\n💡 Files saved locally. Check your folder for the reports.")